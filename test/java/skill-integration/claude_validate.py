@@ -7,8 +7,15 @@ Uses Claude AI to intelligently analyze project structure and code quality.
 import os
 import sys
 import json
+import time
+import functools
+import io
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     import anthropic
@@ -17,20 +24,179 @@ except ImportError:
     print("Install it with: pip install anthropic")
     sys.exit(1)
 
+# orjson is optional; it is faster than the standard library json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Colors
 GREEN = '\033[0;32m'
 YELLOW = '\033[1;33m'
 RED = '\033[0;31m'
 NC = '\033[0m'
 
-def print_step(message):
-    print(f"{YELLOW}==> {message}{NC}")
+MODEL = "claude-sonnet-4-5-20250929"
+
+# Bounds on each Anthropic API request; the timeout is in seconds
+API_MAX_RETRIES = 2
+API_TIMEOUT = 120.0
+
+# Seconds between status checks while a validation batch is processing
+BATCH_POLL_INTERVAL = 10
+
+# Threads used to read project files while collecting the structure
+READ_WORKERS = 16
+
+# Build output directories skipped at the workspace root while collecting the
+# structure; hidden directories are skipped at any depth
+SKIP_DIRS = {"target", "build", "node_modules", "__pycache__"}
+
+# Characters of each Java file sent to Claude; longer files are truncated
+JAVA_HEAD_CHARS = 3000
+
+# Maven command; mvnd reuses a running build JVM between the warm-up and compile
+MVN = "mvnd" if shutil.which("mvnd") else "mvn"
+
+# Marker written once the workspace's Maven dependencies have been resolved
+MAVEN_WARM_MARKER = ".mvn-warmed"
+
+# Upper bound on validation request size; Java file contents are omitted beyond it
+MAX_PROMPT_TOKENS = 150_000
+# Conservative lower bound on characters per token, used to skip counting small prompts
+MIN_CHARS_PER_TOKEN = 2
+
+# Room for the full report, including notes on every component; a report
+# cut off at this limit is treated as a failed validation
+VALIDATION_MAX_TOKENS = 1800
 
-def print_success(message):
-    print(f"{GREEN}✓ {message}{NC}")
+VALIDATION_REQUIREMENTS = """# Validation Requirements
 
-def print_error(message):
-    print(f"{RED}✗ {message}{NC}")
+Please validate this Temporal Java application and provide a structured response:
+
+1. **Structure Validation**
+   - Is there a valid pom.xml with Temporal SDK dependency?
+   - Are workflow interface and implementation present?
+   - Are activity interface and implementation present?
+   - Is there a worker class to register workflows/activities?
+   - Is there a client class to start workflows?
+   - Is the package structure reasonable?
+
+2. **Code Quality**
+   - Do workflows follow Temporal patterns (@WorkflowInterface, @WorkflowMethod)?
+   - Do activities follow Temporal patterns (@ActivityInterface, @ActivityMethod)?
+   - Are there any obvious compilation errors?
+   - Are imports reasonable?
+
+3. **Advanced Features** (if present)
+   - Signal methods (@SignalMethod)
+   - Query methods (@QueryMethod)
+   - Spring Boot integration
+   - Testing classes
+
+4. **Flexibility Notes**
+   - Don't be rigid about directory names (workflow vs workflows is fine)
+   - Don't be rigid about file names (HelloWorldWorkflow vs GreetingWorkflow is fine)
+   - Focus on whether the Temporal patterns are correctly implemented
+   - Accept both standard Java and Spring Boot approaches
+
+Report your result by calling the report_validation tool.
+"""
+
+def component_schema(**properties) -> Dict:
+    """Schema for one entry of the report's "structure" section"""
+    return {
+        "type": "object",
+        "properties": {
+            "present": {"type": "boolean"},
+            **properties,
+            "notes": {"type": "string"}
+        }
+    }
+
+def string_list_schema(description: str) -> Dict:
+    """Schema for a list of strings in the report"""
+    return {"type": "array", "items": {"type": "string"}, "description": description}
+
+# Claude reports its result through this tool, so the response is already
+# structured and needs no parsing
+VALIDATION_TOOL = {
+    "name": "report_validation",
+    "description": "Report the validation result for the generated Temporal Java application",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "valid": {"type": "boolean", "description": "Whether the application is valid"},
+            "summary": {"type": "string", "description": "Brief overall assessment"},
+            "structure": {
+                "type": "object",
+                "properties": {
+                    "pom_xml": component_schema(has_temporal_sdk={"type": "boolean"}),
+                    "workflows": component_schema(count={"type": "integer"}),
+                    "activities": component_schema(count={"type": "integer"}),
+                    "worker": component_schema(),
+                    "client": component_schema()
+                }
+            },
+            "code_quality": {
+                "type": "object",
+                "properties": {
+                    "follows_patterns": {"type": "boolean"},
+                    "notes": {"type": "string"}
+                }
+            },
+            "advanced_features": {
+                "type": "object",
+                "properties": {
+                    "signals": {"type": "boolean"},
+                    "queries": {"type": "boolean"},
+                    "spring_boot": {"type": "boolean"},
+                    "tests": {"type": "boolean"}
+                }
+            },
+            "issues": string_list_schema("Issues found, if any"),
+            "warnings": string_list_schema("Warnings, if any"),
+            "recommendations": string_list_schema("Recommendations, if any")
+        },
+        "required": ["valid", "summary"]
+    }
+}
+
+# The validation requirements are identical for every request, so they are
+# sent as a cached system block ahead of the per-project summary
+VALIDATION_SYSTEM = [
+    {
+        "type": "text",
+        "text": VALIDATION_REQUIREMENTS,
+        "cache_control": {"type": "ephemeral"}
+    }
+]
+
+def print_step(message, file=None):
+    print(f"{YELLOW}==> {message}{NC}", file=file)
+
+def print_success(message, file=None):
+    print(f"{GREEN}✓ {message}{NC}", file=file)
+
+def print_error(message, file=None):
+    print(f"{RED}✗ {message}{NC}", file=file)
+
+def read_file(path: Path, limit: Optional[int] = None) -> Tuple[Optional[str], Optional[Exception]]:
+    """
+    Read a text file, returning its content or the error raised.
+    With a limit, only the first `limit` characters are read and a
+    truncation marker is appended if the file is longer.
+    """
+    try:
+        if limit is None:
+            return path.read_text(errors="replace"), None
+        with open(path, 'r', errors="replace") as f:
+            content = f.read(limit + 1)
+        if len(content) > limit:
+            content = content[:limit] + "\n... (truncated)"
+        return content, None
+    except Exception as e:
+        return None, e
 
 def collect_project_structure(workspace_dir: Path) -> Dict:
     """Collect project structure information"""
@@ -44,55 +210,87 @@ def collect_project_structure(workspace_dir: Path) -> Dict:
         "resources": []
     }
 
-    # Collect all files and directories
-    for root, dirs, files in os.walk(workspace_dir):
-        rel_root = Path(root).relative_to(workspace_dir)
-
-        for d in dirs:
-            rel_path = str(rel_root / d)
-            if not rel_path.startswith('.'):
+    # Collect all files and directories, noting which files need their content
+    to_read = []  # (rel_path, absolute path, kind)
+    pending = [(workspace_dir, Path())]
+    while pending:
+        directory, rel_root = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            print(f"  Warning: Could not read {rel_root}: {e}")
+            continue
+        for entry in entries:
+            rel_path = str(rel_root / entry.name)
+
+            if entry.is_dir():
+                # Never descend into build output, VCS or hidden directories.
+                # A package may be named like an output directory, so the
+                # output names are only skipped at the root.
+                if entry.name.startswith('.'):
+                    continue
+                if rel_root == Path() and entry.name in SKIP_DIRS:
+                    continue
                 structure["directories"].append(rel_path)
+                if not entry.is_symlink():
+                    pending.append((Path(entry.path), rel_root / entry.name))
+                continue
 
-        for f in files:
-            rel_path = str(rel_root / f)
             if rel_path.startswith('.'):
                 continue
 
             structure["files"].append(rel_path)
 
             # Collect Java files with content
-            if f.endswith('.java'):
-                file_path = Path(root) / f
-                try:
-                    with open(file_path, 'r') as java_file:
-                        structure["java_files"][rel_path] = java_file.read()
-                except Exception as e:
-                    print(f"  Warning: Could not read {rel_path}: {e}")
+            if entry.name.endswith('.java'):
+                to_read.append((rel_path, Path(entry.path), "java"))
 
             # Collect pom.xml
-            elif f == 'pom.xml':
-                file_path = Path(root) / f
-                try:
-                    with open(file_path, 'r') as pom_file:
-                        structure["pom_xml"] = pom_file.read()
-                except Exception as e:
-                    print(f"  Warning: Could not read pom.xml: {e}")
+            elif entry.name == 'pom.xml':
+                to_read.append((rel_path, Path(entry.path), "pom"))
 
             # Collect resources
             elif 'resources' in str(rel_root):
                 structure["resources"].append(rel_path)
 
+    # Read file contents concurrently; the reads are independent and I/O-bound
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        contents = list(executor.map(
+            read_file,
+            [path for _, path, _ in to_read],
+            # Only the head of each Java file is sent to Claude; the full pom.xml is
+            # read because it drives the SDK dependency check
+            [JAVA_HEAD_CHARS if kind == "java" else None for _, _, kind in to_read]
+        ))
+
+    for (rel_path, _, kind), (content, error) in zip(to_read, contents):
+        if error is not None:
+            name = rel_path if kind == "java" else "pom.xml"
+            print(f"  Warning: Could not read {name}: {error}")
+        elif kind == "java":
+            structure["java_files"][rel_path] = content
+        else:
+            structure["pom_xml"] = content
+
     print_success(f"Collected {len(structure['files'])} files, {len(structure['java_files'])} Java files")
     return structure
 
-def invoke_claude_validation(structure: Dict, api_key: str) -> Dict:
-    """Use Claude to validate the project structure"""
-    print_step("Invoking Claude for intelligent validation...")
-
-    client = anthropic.Anthropic(api_key=api_key)
-
+@functools.lru_cache(maxsize=1)
+def get_client(api_key: str) -> anthropic.Anthropic:
+    """
+    Return the Anthropic client, created once per process so its
+    connection pool is reused across validation calls.
+    """
+    return anthropic.Anthropic(
+        api_key=api_key,
+        max_retries=API_MAX_RETRIES,
+        timeout=API_TIMEOUT
+    )
+
+def build_validation_prompt(structure: Dict) -> str:
+    """Build the validation prompt for a single project structure"""
     # Build a concise summary for Claude
-    summary = f"""
+    parts = [f"""
 # Project Structure Analysis Request
 
 Please analyze this generated Temporal Java application and validate it.
@@ -109,112 +307,124 @@ Please analyze this generated Temporal Java application and validate it.
 ```
 
 ## Java Files
-"""
+"""]
 
-    # Add Java files (with truncation for very long files)
+    # Add Java files (already truncated to their head when collected)
     for file_path, content in structure['java_files'].items():
-        # Truncate very long files to save tokens
-        if len(content) > 3000:
-            content = content[:3000] + "\n... (truncated)"
-        summary += f"\n### {file_path}\n```java\n{content}\n```\n"
-
-    validation_prompt = summary + """
-
-# Validation Requirements
+        parts.append(f"\n### {file_path}\n```java\n{content}\n```\n")
+
+    return "".join(parts)
+
+def fit_validation_prompt(client, structure: Dict) -> str:
+    """
+    Build the validation prompt, omitting Java file contents (largest
+    first) if the request would exceed MAX_PROMPT_TOKENS. Omitted files
+    are still listed under "Files Present".
+    """
+    prompt = build_validation_prompt(structure)
+
+    # Below this size the prompt cannot reach the limit, so skip counting
+    if len(prompt) < MAX_PROMPT_TOKENS * MIN_CHARS_PER_TOKEN:
+        return prompt
+
+    java_files = dict(structure["java_files"])
+    remaining = sorted(java_files, key=lambda f: len(java_files[f]), reverse=True)
+    while True:
+        input_tokens = client.messages.count_tokens(
+            model=MODEL,
+            system=VALIDATION_SYSTEM,
+            tools=[VALIDATION_TOOL],
+            messages=[{"role": "user", "content": prompt}]
+        ).input_tokens
+        print(f"  Validation prompt: {input_tokens} tokens")
+        if input_tokens <= MAX_PROMPT_TOKENS or not remaining:
+            return prompt
+
+        # Omit enough of the largest files to cover the estimated excess
+        excess_chars = (input_tokens - MAX_PROMPT_TOKENS) * len(prompt) / input_tokens
+        while remaining and excess_chars > 0:
+            file_path = remaining.pop(0)
+            excess_chars -= len(java_files[file_path])
+            java_files[file_path] = "// (contents omitted to fit the prompt size limit)"
+        print(f"  {YELLOW}Prompt too large, omitted {len(java_files) - len(remaining)} Java file(s){NC}")
+
+        prompt = build_validation_prompt({**structure, "java_files": java_files})
+
+def validation_result_from(message) -> Dict:
+    """
+    Return the input of the report_validation tool call in a response.
+    A report cut off by the token limit or missing required fields is
+    treated as a failed validation, never as a result.
+    """
+    if message.stop_reason == "max_tokens":
+        # The SDK still returns a tool_use block, parsed from the partial JSON
+        print_error(f"Response hit the {VALIDATION_MAX_TOKENS} token limit; validation report is truncated")
+        return {
+            "valid": False,
+            "summary": f"Validation report truncated at the {VALIDATION_MAX_TOKENS} token limit"
+        }
 
-Please validate this Temporal Java application and provide a structured response:
+    for block in message.content:
+        if block.type == "tool_use" and block.name == VALIDATION_TOOL["name"]:
+            report = dict(block.input)
+            missing = [key for key in VALIDATION_TOOL["input_schema"]["required"] if key not in report]
+            if missing:
+                print_error(f"Validation report is missing fields: {', '.join(missing)}")
+                return {
+                    "valid": False,
+                    "summary": f"Incomplete validation report (missing: {', '.join(missing)})"
+                }
+            return report
 
-1. **Structure Validation**
-   - Is there a valid pom.xml with Temporal SDK dependency?
-   - Are workflow interface and implementation present?
-   - Are activity interface and implementation present?
-   - Is there a worker class to register workflows/activities?
-   - Is there a client class to start workflows?
-   - Is the package structure reasonable?
+    print_error("Response did not include a validation report")
+    return {
+        "valid": False,
+        "summary": f"No validation report in response (stop reason: {message.stop_reason})"
+    }
 
-2. **Code Quality**
-   - Do workflows follow Temporal patterns (@WorkflowInterface, @WorkflowMethod)?
-   - Do activities follow Temporal patterns (@ActivityInterface, @ActivityMethod)?
-   - Are there any obvious compilation errors?
-   - Are imports reasonable?
+def print_usage(usage) -> None:
+    """Print token usage, including prompt cache reads and writes"""
+    print(f"  Tokens: {usage.input_tokens} input, {usage.output_tokens} output, "
+          f"{usage.cache_read_input_tokens or 0} cache read, "
+          f"{usage.cache_creation_input_tokens or 0} cache write")
 
-3. **Advanced Features** (if present)
-   - Signal methods (@SignalMethod)
-   - Query methods (@QueryMethod)
-   - Spring Boot integration
-   - Testing classes
+def write_json(path: Path, data) -> None:
+    """Write data to a file as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
 
-4. **Flexibility Notes**
-   - Don't be rigid about directory names (workflow vs workflows is fine)
-   - Don't be rigid about file names (HelloWorldWorkflow vs GreetingWorkflow is fine)
-   - Focus on whether the Temporal patterns are correctly implemented
-   - Accept both standard Java and Spring Boot approaches
+def invoke_claude_validation(structure: Dict, api_key: str) -> Dict:
+    """Use Claude to validate the project structure"""
+    print_step("Invoking Claude for intelligent validation...")
 
-Please provide your response in this JSON format:
-```json
-{
-  "valid": true/false,
-  "summary": "Brief overall assessment",
-  "structure": {
-    "pom_xml": {"present": true/false, "has_temporal_sdk": true/false, "notes": "..."},
-    "workflows": {"present": true/false, "count": N, "notes": "..."},
-    "activities": {"present": true/false, "count": N, "notes": "..."},
-    "worker": {"present": true/false, "notes": "..."},
-    "client": {"present": true/false, "notes": "..."}
-  },
-  "code_quality": {
-    "follows_patterns": true/false,
-    "notes": "..."
-  },
-  "advanced_features": {
-    "signals": true/false,
-    "queries": true/false,
-    "spring_boot": true/false,
-    "tests": true/false
-  },
-  "issues": ["list of issues if any"],
-  "warnings": ["list of warnings if any"],
-  "recommendations": ["list of recommendations if any"]
-}
-```
-"""
+    client = get_client(api_key)
 
     try:
-        message = client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=4000,
+        validation_prompt = fit_validation_prompt(client, structure)
+
+        # Stream the response so the connection stays active while it is generated
+        with client.messages.stream(
+            model=MODEL,
+            max_tokens=VALIDATION_MAX_TOKENS,
+            system=VALIDATION_SYSTEM,
+            tools=[VALIDATION_TOOL],
+            tool_choice={"type": "tool", "name": VALIDATION_TOOL["name"]},
             messages=[
                 {
                     "role": "user",
                     "content": validation_prompt
                 }
             ]
-        )
+        ) as stream:
+            message = stream.get_final_message()
 
-        response_text = message.content[0].text
-        print_success(f"Received validation response ({len(response_text)} chars)")
+        print_success("Received validation response")
+        print_usage(message.usage)
 
-        # Extract JSON from response (may be wrapped in markdown)
-        import re
-        json_match = re.search(r'```json\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-        if json_match:
-            json_text = json_match.group(1)
-        else:
-            # Try to find JSON without markdown wrapper
-            json_match = re.search(r'\{.*"valid".*\}', response_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(0)
-            else:
-                print_error("Could not extract JSON from response")
-                print("Response:", response_text[:500])
-                return {
-                    "valid": False,
-                    "summary": "Failed to parse validation response",
-                    "raw_response": response_text
-                }
-
-        validation_result = json.loads(json_text)
-        return validation_result
+        return validation_result_from(message)
 
     except Exception as e:
         print_error(f"Validation failed: {e}")
@@ -224,6 +434,97 @@ Please provide your response in this JSON format:
             "error": str(e)
         }
 
+def submit_validation_batch(structures: List[Dict], api_key: str) -> str:
+    """
+    Submit one validation request per project structure as a single
+    Message Batch. Returns the batch id.
+    """
+    print_step(f"Submitting validation batch ({len(structures)} workspaces)...")
+
+    client = get_client(api_key)
+
+    batch = client.messages.batches.create(
+        requests=[
+            {
+                "custom_id": f"workspace-{index}",
+                "params": {
+                    "model": MODEL,
+                    "max_tokens": VALIDATION_MAX_TOKENS,
+                    "system": VALIDATION_SYSTEM,
+                    "tools": [VALIDATION_TOOL],
+                    "tool_choice": {"type": "tool", "name": VALIDATION_TOOL["name"]},
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": fit_validation_prompt(client, structure)
+                        }
+                    ]
+                }
+            }
+            for index, structure in enumerate(structures)
+        ]
+    )
+
+    print_success(f"Submitted batch {batch.id}")
+    return batch.id
+
+def collect_validation_results(batch_id: str, api_key: str) -> Dict[str, Dict]:
+    """
+    Wait for a validation batch to finish and return the parsed
+    validation results keyed by custom_id.
+    """
+    print_step(f"Waiting for validation batch {batch_id}...")
+
+    client = get_client(api_key)
+
+    while True:
+        batch = client.messages.batches.retrieve(batch_id)
+        if batch.processing_status == "ended":
+            break
+        counts = batch.request_counts
+        print(f"  {counts.processing} processing, {counts.succeeded} succeeded, {counts.errored} errored")
+        time.sleep(BATCH_POLL_INTERVAL)
+
+    results = {}
+    for entry in client.messages.batches.results(batch_id):
+        if entry.result.type == "succeeded":
+            print_success(f"Received validation response for {entry.custom_id}")
+            print_usage(entry.result.message.usage)
+            results[entry.custom_id] = validation_result_from(entry.result.message)
+        else:
+            print_error(f"Validation request {entry.custom_id} {entry.result.type}")
+            results[entry.custom_id] = {
+                "valid": False,
+                "summary": f"Batch request {entry.result.type}",
+                "error": str(getattr(entry.result, "error", entry.result.type))
+            }
+
+    return results
+
+def validate_batch(structures: List[Dict], api_key: str) -> List[Dict]:
+    """Validate several project structures with one Message Batch"""
+    try:
+        batch_id = submit_validation_batch(structures, api_key)
+        results = collect_validation_results(batch_id, api_key)
+    except Exception as e:
+        print_error(f"Validation failed: {e}")
+        return [
+            {
+                "valid": False,
+                "summary": f"API call failed: {str(e)}",
+                "error": str(e)
+            }
+            for _ in structures
+        ]
+
+    return [
+        results.get(f"workspace-{index}", {
+            "valid": False,
+            "summary": "No result returned for workspace"
+        })
+        for index in range(len(structures))
+    ]
+
 def print_validation_results(result: Dict):
     """Print validation results in a readable format"""
     print("\n" + "="*60)
@@ -319,54 +620,136 @@ def print_validation_results(result: Dict):
 
     print("="*60)
 
-def test_compilation(workspace_dir: Path) -> bool:
-    """Test if the project compiles with Maven"""
-    print_step("Testing compilation with Maven...")
-
-    import subprocess
-
+@functools.lru_cache(maxsize=1)
+def maven_available() -> bool:
+    """Check once per process whether Maven can be run"""
     try:
-        # Check if mvn is available
         result = subprocess.run(
-            ["mvn", "--version"],
-            cwd=workspace_dir,
-            capture_output=True,
+            [MVN, "--version"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=10
         )
-
-        if result.returncode != 0:
-            print(f"  {YELLOW}Maven not available, skipping compilation test{NC}")
-            return True  # Don't fail if Maven isn't available
-
+        return result.returncode == 0
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        print(f"  {YELLOW}Maven not available, skipping compilation test{NC}")
+        return False
+
+def warm_maven_repository(workspace_dir: Path, out) -> bool:
+    """
+    Resolve the project's dependencies into the local repository so the
+    build can run offline. The result is recorded in a marker file that is
+    reused until pom.xml changes. Progress is written to out. Returns True
+    if the repository is warm.
+    """
+    marker = workspace_dir / MAVEN_WARM_MARKER
+    pom = workspace_dir / "pom.xml"
+    if not pom.exists():
+        return False
+    if marker.exists() and marker.stat().st_mtime >= pom.stat().st_mtime:
         return True
 
-    # Try to compile
+    print(f"  Running: {MVN} dependency:go-offline", file=out)
     try:
-        print("  Running: mvn clean compile")
         result = subprocess.run(
-            ["mvn", "clean", "compile", "-q"],
+            [MVN, "-B", "-q", "dependency:go-offline"],
             cwd=workspace_dir,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=180  # 3 minutes
         )
+    except subprocess.TimeoutExpired:
+        print(f"  {YELLOW}Dependency resolution timed out, building online{NC}", file=out)
+        return False
 
-        if result.returncode == 0:
-            print_success("Compilation successful")
-            return True
-        else:
-            print_error("Compilation failed")
-            print("\nBuild output:")
-            print(result.stdout.decode())
-            print(result.stderr.decode())
-            return False
+    if result.returncode != 0:
+        print(f"  {YELLOW}Dependency resolution failed, building online{NC}", file=out)
+        return False
+
+    marker.touch()
+    return True
+
+def run_maven(command: List[str], workspace_dir: Path, log) -> int:
+    """Run a Maven command with its output written to the log file"""
+    log.seek(0)
+    log.truncate()
+    result = subprocess.run(
+        command,
+        cwd=workspace_dir,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        timeout=180  # 3 minutes
+    )
+    return result.returncode
+
+def log_contains(log, text: str) -> bool:
+    """Check whether any line of the log file contains the text"""
+    log.seek(0)
+    return any(text in line for line in log)
+
+def test_compilation(workspace_dir: Path) -> Tuple[bool, str]:
+    """
+    Test if the project compiles with Maven. Runs alongside the validation
+    request, so its output, including the build log on failure, is returned
+    for printing rather than printed. Returns (compiled, output).
+    """
+    out = io.StringIO()
+    print_step("Testing compilation with Maven...", file=out)
+
+    if not maven_available():
+        print(f"  {YELLOW}Maven not available, skipping compilation test{NC}", file=out)
+        return True, out.getvalue()  # Don't fail if Maven isn't available
+
+    # The sources are freshly generated, so there are no stale classes to clean
+    command = [MVN, "-B", "-T", "1C", "-q", "compile"]
+    offline_command = [MVN, "-B", "-o", "-T", "1C", "-q", "compile"]
+
+    # Try to compile. Build output goes to a temporary file and is only
+    # read back if the build fails.
+    try:
+        offline = warm_maven_repository(workspace_dir, out)
+        with tempfile.TemporaryFile(mode='w+', errors="replace") as log:
+            print(f"  Running: {' '.join(offline_command if offline else command)}", file=out)
+            returncode = run_maven(offline_command if offline else command, workspace_dir, log)
+
+            # go-offline does not resolve every plugin dependency; retry online
+            if returncode != 0 and offline and log_contains(log, "offline mode"):
+                print(f"  {YELLOW}Missing artifacts in offline mode, retrying online{NC}", file=out)
+                returncode = run_maven(command, workspace_dir, log)
+
+            if returncode == 0:
+                print_success("Compilation successful", file=out)
+                return True, out.getvalue()
+            else:
+                print_error("Compilation failed", file=out)
+                print("\nBuild output:", file=out)
+                log.seek(0)
+                out.writelines(log)
+                return False, out.getvalue()
 
     except subprocess.TimeoutExpired:
-        print_error("Compilation timed out after 3 minutes")
-        return False
+        print_error("Compilation timed out after 3 minutes", file=out)
+        return False, out.getvalue()
     except Exception as e:
-        print_error(f"Compilation test failed: {e}")
+        print_error(f"Compilation test failed: {e}", file=out)
+        return False, out.getvalue()
+
+def print_verdict(result: Dict, compilation_ok: bool) -> bool:
+    """Print the final verdict for one workspace. Returns True if it passed."""
+    print(f"\n{YELLOW}{'='*60}{NC}")
+    if result.get("valid") and compilation_ok:
+        print(f"{GREEN}✓ VALIDATION PASSED{NC}")
+        print(f"{GREEN}  Application structure is valid and compiles successfully{NC}")
+        print(f"{YELLOW}{'='*60}{NC}\n")
+        return True
+    elif result.get("valid"):
+        print(f"{YELLOW}⚠ PARTIAL PASS{NC}")
+        print(f"{YELLOW}  Structure is valid but compilation failed{NC}")
+        print(f"{YELLOW}{'='*60}{NC}\n")
+        return False
+    else:
+        print(f"{RED}✗ VALIDATION FAILED{NC}")
+        print(f"{RED}  Application structure has issues{NC}")
+        print(f"{YELLOW}{'='*60}{NC}\n")
         return False
 
 def main():
@@ -384,63 +767,73 @@ def main():
 
     print_success("Found ANTHROPIC_API_KEY")
 
-    # Get workspace directory
+    # Get workspace directories
     if len(sys.argv) > 1:
-        workspace_dir = Path(sys.argv[1])
+        workspace_dirs = [Path(arg) for arg in sys.argv[1:]]
     elif 'TEST_WORKSPACE' in os.environ:
-        workspace_dir = Path(os.environ['TEST_WORKSPACE'])
-    else:
-        workspace_dir = Path.cwd()
-
-    if not workspace_dir.exists():
-        print_error(f"Workspace directory does not exist: {workspace_dir}")
-        sys.exit(1)
-
-    print(f"Workspace: {workspace_dir}\n")
-
-    # Collect project structure
-    structure = collect_project_structure(workspace_dir)
-
-    if not structure["java_files"]:
-        print_error("No Java files found in workspace")
-        sys.exit(1)
-
-    if not structure["pom_xml"]:
-        print_error("No pom.xml found in workspace")
-        sys.exit(1)
-
-    # Run Claude validation
-    result = invoke_claude_validation(structure, api_key)
-
-    # Save result for debugging
-    result_file = workspace_dir / "validation-result.json"
-    with open(result_file, 'w') as f:
-        json.dump(result, f, indent=2)
-    print(f"\n  Saved validation result to: {result_file}")
-
-    # Print results
-    print_validation_results(result)
-
-    # Test compilation
-    compilation_ok = test_compilation(workspace_dir)
-
-    # Final verdict
-    print(f"\n{YELLOW}{'='*60}{NC}")
-    if result.get("valid") and compilation_ok:
-        print(f"{GREEN}✓ VALIDATION PASSED{NC}")
-        print(f"{GREEN}  Application structure is valid and compiles successfully{NC}")
-        print(f"{YELLOW}{'='*60}{NC}\n")
-        sys.exit(0)
-    elif result.get("valid"):
-        print(f"{YELLOW}⚠ PARTIAL PASS{NC}")
-        print(f"{YELLOW}  Structure is valid but compilation failed{NC}")
-        print(f"{YELLOW}{'='*60}{NC}\n")
-        sys.exit(1)
+        workspace_dirs = [Path(os.environ['TEST_WORKSPACE'])]
     else:
-        print(f"{RED}✗ VALIDATION FAILED{NC}")
-        print(f"{RED}  Application structure has issues{NC}")
-        print(f"{YELLOW}{'='*60}{NC}\n")
-        sys.exit(1)
+        workspace_dirs = [Path.cwd()]
+
+    for workspace_dir in workspace_dirs:
+        if not workspace_dir.exists():
+            print_error(f"Workspace directory does not exist: {workspace_dir}")
+            sys.exit(1)
+
+    # Collect project structures
+    structures = []
+    for workspace_dir in workspace_dirs:
+        print(f"Workspace: {workspace_dir}\n")
+
+        structure = collect_project_structure(workspace_dir)
+
+        if not structure["java_files"]:
+            print_error(f"No Java files found in workspace: {workspace_dir}")
+            sys.exit(1)
+
+        if not structure["pom_xml"]:
+            print_error(f"No pom.xml found in workspace: {workspace_dir}")
+            sys.exit(1)
+
+        structures.append(structure)
+
+    # Run Claude validation and compilation concurrently; they share no state.
+    # Several workspaces share a single validation batch and compile in turn.
+    # Compilation output is held until both finish so the two do not interleave.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        if len(structures) == 1:
+            validation_future = executor.submit(
+                lambda: [invoke_claude_validation(structures[0], api_key)]
+            )
+        else:
+            validation_future = executor.submit(validate_batch, structures, api_key)
+        compilation_future = executor.submit(
+            lambda: [test_compilation(workspace_dir) for workspace_dir in workspace_dirs]
+        )
+        results = validation_future.result()
+        compilation_results = compilation_future.result()
+
+    all_passed = True
+    for workspace_dir, result, (compilation_ok, compilation_output) in zip(
+        workspace_dirs, results, compilation_results
+    ):
+        if len(workspace_dirs) > 1:
+            print(f"\n{YELLOW}Workspace: {workspace_dir}{NC}")
+
+        # Save result for debugging
+        result_file = workspace_dir / "validation-result.json"
+        write_json(result_file, result)
+        print(f"\n  Saved validation result to: {result_file}")
+
+        # Print results
+        print_validation_results(result)
+        print(compilation_output, end="")
+
+        # Final verdict
+        if not print_verdict(result, compilation_ok):
+            all_passed = False
+
+    sys.exit(0 if all_passed else 1)
 
 if __name__ == "__main__":
     main()
@@ -6,8 +6,10 @@ This replaces the old automate_test.py that used the Anthropic API directly.
 
 import os
 import sys
+import functools
 import subprocess
 import shutil
+import threading
 from pathlib import Path
 
 # Colors
@@ -25,11 +27,21 @@ def print_success(message):
 def print_error(message):
     print(f"{RED}✗ {message}{NC}")
 
+@functools.lru_cache(maxsize=1)
+def find_claude_cli():
+    """Locate the Claude CLI on PATH, once per process"""
+    return shutil.which('claude')
+
+@functools.lru_cache(maxsize=1)
+def get_api_key():
+    """Read ANTHROPIC_API_KEY, once per process"""
+    return os.environ.get('ANTHROPIC_API_KEY')
+
 def check_claude_code_installed():
     """Check if Claude CLI is available"""
     print_step("Checking for Claude CLI...")
 
-    if shutil.which('claude'):
+    if find_claude_cli():
         print_success("Claude CLI found")
         return True
     else:
@@ -44,8 +56,7 @@ def check_api_key():
     """Check if ANTHROPIC_API_KEY is set"""
     print_step("Checking for ANTHROPIC_API_KEY...")
 
-    api_key = os.environ.get('ANTHROPIC_API_KEY')
-    if api_key:
+    if get_api_key():
         print_success("ANTHROPIC_API_KEY found")
         return True
     else:
@@ -84,7 +95,7 @@ def invoke_claude_code(workspace_dir: Path, prompt: str) -> bool:
         # Invoke claude with prompt piped to stdin
         # Use cwd parameter to set working directory so skills are auto-loaded from .claude/skills/
         process = subprocess.Popen(
-            ['claude', '--print'],
+            [find_claude_cli() or 'claude', '--print'],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
@@ -93,11 +104,24 @@ def invoke_claude_code(workspace_dir: Path, prompt: str) -> bool:
             bufsize=1  # Line buffered
         )
 
-        # Send the prompt and close stdin
-        stdout, _ = process.communicate(input=prompt)
+        # Stream output to console line by line while the prompt is written
+        def forward_output():
+            for line in process.stdout:
+                print(line, end="", flush=True)
+
+        reader = threading.Thread(target=forward_output, daemon=True)
+        reader.start()
+
+        # Send the prompt and close stdin. If Claude exits before reading it
+        # (e.g. an auth failure), its own output and exit code report why.
+        try:
+            process.stdin.write(prompt)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
 
-        # Stream output to console
-        print(stdout)
+        reader.join()
+        process.wait()
 
         # Check exit code
         if process.returncode == 0:
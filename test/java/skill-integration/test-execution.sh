@@ -131,15 +131,73 @@ echo -e "${GREEN}✓ Found client class: $CLIENT_CLASS${NC}"
 
 echo ""
 
+# Use the Maven Daemon when it is installed
+if command -v mvnd &> /dev/null; then
+    MVN=mvnd
+else
+    MVN=mvn
+fi
+
+# Build once and resolve the runtime classpath, so the worker and client run
+# on plain java instead of each paying for a separate mvn exec:java startup
+build_app() {
+    $MVN -B -q $1 -T 1C compile dependency:build-classpath \
+        -Dmdep.includeScope=runtime -Dmdep.outputFile=target/classpath.txt > build.log 2>&1
+}
+
+echo -e "${YELLOW}Building application...${NC}"
+
+# Resolve dependencies into the local repository once so the build can run
+# offline. The marker is shared with claude_validate.py and reused until
+# pom.xml changes.
+MAVEN_OFFLINE=""
+if [ -f .mvn-warmed ] && [ ! pom.xml -nt .mvn-warmed ]; then
+    MAVEN_OFFLINE="-o"
+elif $MVN -B -q dependency:go-offline > /dev/null 2>&1; then
+    touch .mvn-warmed
+    MAVEN_OFFLINE="-o"
+fi
+
+BUILD_OK=false
+if build_app "$MAVEN_OFFLINE"; then
+    BUILD_OK=true
+elif [ -n "$MAVEN_OFFLINE" ] && grep -q "offline mode" build.log; then
+    # go-offline does not resolve every plugin dependency; retry online
+    echo -e "  ${YELLOW}Missing artifacts in offline mode, retrying online${NC}"
+    if build_app ""; then
+        BUILD_OK=true
+    fi
+fi
+
+if [ "$BUILD_OK" != true ]; then
+    echo -e "${RED}✗ Build failed${NC}"
+    echo -e "Last 20 lines of build.log:"
+    tail -20 build.log
+    exit 1
+fi
+APP_CLASSPATH="target/classes:$(cat target/classpath.txt)"
+echo -e "${GREEN}✓ Build complete${NC}"
+
+echo ""
+
 # Start the worker in background
 echo -e "${YELLOW}Starting worker...${NC}"
-mvn exec:java -Dexec.mainClass="$WORKER_CLASS" > worker.log 2>&1 &
+java -cp "$APP_CLASSPATH" "$WORKER_CLASS" > worker.log 2>&1 &
 WORKER_PID=$!
 echo -e "  Worker started (PID: $WORKER_PID)"
 
-# Wait for worker to initialize
+# Wait for worker to initialize: until it logs "Worker started", exits, or
+# 15 seconds pass
 echo -e "  Waiting for worker to initialize..."
-sleep 5
+for i in {1..30}; do
+    if ! kill -0 $WORKER_PID 2>/dev/null; then
+        break
+    fi
+    if grep -q -i "worker started" worker.log 2>/dev/null; then
+        break
+    fi
+    sleep 0.5
+done
 
 # Check if worker is still running
 if ! kill -0 $WORKER_PID 2>/dev/null; then
@@ -157,13 +215,9 @@ echo -e "${YELLOW}Executing workflow via client...${NC}"
 WORKFLOW_OUTPUT=$(mktemp)
 
 # Run client and capture output
-if mvn exec:java -Dexec.mainClass="$CLIENT_CLASS" -Dexec.args="TestUser" > "$WORKFLOW_OUTPUT" 2>&1; then
+if java -cp "$APP_CLASSPATH" "$CLIENT_CLASS" TestUser > "$WORKFLOW_OUTPUT" 2>&1; then
     echo -e "${GREEN}✓ Workflow execution started${NC}"
 
-    # Give it time to complete
-    echo -e "  Waiting for workflow to complete..."
-    sleep 5
-
     # Check for success indicators in output
     if grep -q -i "completed\|success\|hello" "$WORKFLOW_OUTPUT"; then
         echo -e "${GREEN}✓ Workflow completed successfully${NC}"
@@ -202,7 +256,7 @@ fi
 
 # Clean up log files
 echo -e "\n${YELLOW}Cleaning up log files...${NC}"
-rm -f worker.log temporal-server.log
+rm -f build.log worker.log temporal-server.log
 echo -e "${GREEN}✓ Cleanup complete${NC}"
 
 echo ""
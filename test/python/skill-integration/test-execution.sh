@@ -156,13 +156,23 @@ echo ""
 
 # Start the worker in background
 echo -e "${YELLOW}Starting worker...${NC}"
-python3 "$WORKER_FILE" > worker.log 2>&1 &
+# Unbuffered, so the worker's startup message reaches worker.log immediately
+python3 -u "$WORKER_FILE" > worker.log 2>&1 &
 WORKER_PID=$!
 echo -e "  Worker started (PID: $WORKER_PID)"
 
-# Wait for worker to initialize
+# Wait for worker to initialize: until it logs "Worker started", exits, or
+# 15 seconds pass
 echo -e "  Waiting for worker to initialize..."
-sleep 5
+for i in {1..30}; do
+    if ! kill -0 $WORKER_PID 2>/dev/null; then
+        break
+    fi
+    if grep -q -i "worker started" worker.log 2>/dev/null; then
+        break
+    fi
+    sleep 0.5
+done
 
 # Check if worker is still running
 if ! kill -0 $WORKER_PID 2>/dev/null; then
@@ -216,10 +226,6 @@ else
     exit 1
 fi
 
-# Give it time to complete
-echo -e "  Waiting for workflow to complete..."
-sleep 5
-
 # Check for success indicators in output
 if grep -q -i "completed\|success\|hello\|result" "$WORKFLOW_OUTPUT"; then
     echo -e "${GREEN}✓ Workflow completed successfully${NC}"